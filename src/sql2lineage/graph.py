@@ -3,7 +3,28 @@
 This module defines a LineageGraph class that uses NetworkX to represent.
 """
 
-from typing import Any, List, Literal, Optional, Sequence, Set, cast
+import pickle
+import sys
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    ParamSpec,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import networkx as nx
 from networkx.exception import NetworkXError
@@ -16,6 +37,125 @@ from sql2lineage.types.model import ColumnLineage, LineageNode, TableLineage
 from sql2lineage.types.utils import NodeType
 from sql2lineage.utils import filter_intermediate_nodes
 
+_LINEAGE_NODE_FIELDS = tuple(
+    name for name in LineageNode.model_fields if name not in ("source", "target")
+)
+"""LineageNode fields, other than `source` and `target`, stored as edge attributes."""
+
+
+def _edge_from_model(model: NodeType) -> Tuple[str, str, dict[str, Any]]:
+    """Convert a node into a `(source, target, attributes)` edge tuple.
+
+    If the node is a BaseModel its fields, other than `source` and `target`, are
+    used as the edge attributes, otherwise the edge has no attributes.
+
+    Args:
+        model (NodeType): The node to convert.
+
+    Returns:
+        Tuple[str, str, dict[str, Any]]: The source, target and attributes of the edge.
+
+    """
+    attrs = {}
+
+    if type(model) is LineageNode:
+        # LineageNode only holds plain values so the attributes can be read
+        # directly rather than serialising the model
+        attrs = {
+            name: value
+            for name in _LINEAGE_NODE_FIELDS
+            if (value := getattr(model, name, None)) is not None
+        }
+        if model.model_extra:
+            attrs.update(
+                (name, value)
+                for name, value in model.model_extra.items()
+                if value is not None
+            )
+
+    elif isinstance(model, BaseModel):
+        # if the edge is a BaseModel we might have extra attributes
+        # that we want to add to the graph
+        attrs = model.model_dump(
+            exclude_unset=True,
+            exclude_none=True,
+            exclude={"target", "source"},
+        )
+
+    # node names repeat across many edges, interning them means the graph's
+    # dict keys share one string object per name
+    return sys.intern(str(model.source)), sys.intern(str(model.target)), attrs
+
+
+_PATH_CACHE_SIZE = 1024
+"""The maximum number of lineage queries held in a LineageGraph's cache."""
+
+_PathCacheKey = Tuple[str, str, str, Optional[int]]
+
+
+def _copy_chains(chains: List[List[LineageNode]]) -> List[List[LineageNode]]:
+    """Copy lineage chains so the caller can change them without altering the cache.
+
+    Args:
+        chains (List[List[LineageNode]]): The chains to copy.
+
+    Returns:
+        List[List[LineageNode]]: New chains holding copies of the nodes.
+
+    """
+    return [[node.model_copy() for node in chain] for chain in chains]
+
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+
+def _counts_changes(method: Callable[_P, _R]) -> Callable[_P, _R]:
+    """Wrap a `_LineageDiGraph` method so each call is counted as a change.
+
+    Args:
+        method (Callable[_P, _R]): The method which changes the graph.
+
+    Returns:
+        Callable[_P, _R]: The wrapped method.
+
+    """
+
+    @wraps(method)
+    def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+        graph = cast("_LineageDiGraph", args[0])
+        graph.version += 1
+        return method(*args, **kwargs)
+
+    return wrapper
+
+
+class _LineageDiGraph(nx.DiGraph):
+    """A DiGraph which counts the changes made to its nodes and edges.
+
+    The count lets LineageGraph tell when cached lineage and its root and leaf
+    classifications are stale, including when
+    the graph is changed directly rather than through `add_edges`. Changes made
+    to edge data in place, e.g. `graph["a"]["b"]["node_type"] = ...`, are not
+    counted.
+    """
+
+    def __init__(self, incoming_graph_data=None, **attr):
+        # set before the parent populates the graph from `incoming_graph_data`
+        self.version = 0
+        super().__init__(incoming_graph_data, **attr)
+
+    add_node = _counts_changes(nx.DiGraph.add_node)
+    add_nodes_from = _counts_changes(nx.DiGraph.add_nodes_from)
+    remove_node = _counts_changes(nx.DiGraph.remove_node)
+    remove_nodes_from = _counts_changes(nx.DiGraph.remove_nodes_from)
+    add_edge = _counts_changes(nx.DiGraph.add_edge)
+    add_edges_from = _counts_changes(nx.DiGraph.add_edges_from)
+    remove_edge = _counts_changes(nx.DiGraph.remove_edge)
+    remove_edges_from = _counts_changes(nx.DiGraph.remove_edges_from)
+    clear = _counts_changes(nx.DiGraph.clear)
+    clear_edges = _counts_changes(nx.DiGraph.clear_edges)
+
 
 class LineageGraph:
     """LineageGraph.
@@ -33,7 +173,116 @@ class LineageGraph:
     """Attributes to be taken from the edges of the graph."""
 
     def __init__(self):
-        self.graph = nx.DiGraph()
+        self._path_cache: OrderedDict[_PathCacheKey, List[List[LineageNode]]] = (
+            OrderedDict()
+        )
+        self._cached_version: Optional[Tuple[int, int]] = None
+        self._typed_nodes: Tuple[dict[str, Set[str]], dict[str, Set[str]]] = ({}, {})
+        self._typed_nodes_version: Optional[Tuple[int, int]] = None
+        self.graph = _LineageDiGraph()
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        """The NetworkX graph holding the lineage edges."""
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph: nx.DiGraph):
+        self._graph = graph
+        self._path_cache.clear()
+        self._cached_version = None
+        self._typed_nodes_version = None
+
+    def _graph_version(self) -> Optional[Tuple[int, int]]:
+        """Identify the current state of the graph.
+
+        Returns:
+            Optional[Tuple[int, int]]: The id and change count of the graph, or None
+                if the graph does not count its changes and so cannot be cached.
+
+        """
+        version = getattr(self._graph, "version", None)
+        if version is None:
+            return None
+        return id(self._graph), version
+
+    def _get_typed_nodes(
+        self,
+    ) -> Optional[Tuple[dict[str, Set[str]], dict[str, Set[str]]]]:
+        """Get the nodes with incoming and outgoing edges of each node_type.
+
+        The nodes are collected in one pass over the edges and kept until the graph
+        changes, so root and leaf checks do not have to scan a node's edges.
+
+        Returns:
+            Optional[Tuple[dict[str, Set[str]], dict[str, Set[str]]]]: The nodes with
+                incoming edges and the nodes with outgoing edges, keyed by node_type,
+                or None if the graph does not count its changes.
+
+        """
+        version = self._graph_version()
+        if version is None:
+            return None
+
+        if version != self._typed_nodes_version:
+            targets: dict[str, Set[str]] = {}
+            sources: dict[str, Set[str]] = {}
+            for u, v, node_type in self._graph.edges.data("node_type"):
+                if node_type is None:
+                    continue
+                targets.setdefault(node_type, set()).add(v)
+                sources.setdefault(node_type, set()).add(u)
+
+            self._typed_nodes = (targets, sources)
+            self._typed_nodes_version = version
+
+        return self._typed_nodes
+
+    def _get_cached_paths(
+        self, key: _PathCacheKey
+    ) -> Optional[List[List[LineageNode]]]:
+        """Get the chains cached for a lineage query.
+
+        The cache is emptied first if the graph has changed since it was filled.
+
+        Args:
+            key (_PathCacheKey): The query the chains were cached for.
+
+        Returns:
+            Optional[List[List[LineageNode]]]: A copy of the cached chains and their
+                nodes, or None
+                if the query is not cached.
+
+        """
+        version = self._graph_version()
+        if version is None or version != self._cached_version:
+            self._path_cache.clear()
+            self._cached_version = version
+            return None
+
+        chains = self._path_cache.get(key)
+        if chains is None:
+            return None
+
+        self._path_cache.move_to_end(key)
+        return _copy_chains(chains)
+
+    def _cache_paths(self, key: _PathCacheKey, chains: List[List[LineageNode]]):
+        """Cache the chains found for a lineage query.
+
+        The least recently used query is dropped once the cache is full.
+
+        Args:
+            key (_PathCacheKey): The query the chains were found for.
+            chains (List[List[LineageNode]]): The chains to cache.
+
+        """
+        if self._cached_version is None:
+            return
+
+        self._path_cache[key] = chains
+        if len(self._path_cache) > _PATH_CACHE_SIZE:
+            self._path_cache.popitem(last=False)
 
     def add_edges(self, edges: Sequence[NodeType]):
         """Add edges to the graph.
@@ -46,23 +295,7 @@ class LineageGraph:
                 to be added to the graph.
 
         """
-
-        def attrs_from_model(model: NodeType) -> dict[str, Any]:
-            attrs = {}
-
-            if isinstance(model, BaseModel):
-                attrs.update(
-                    model.model_dump(
-                        exclude_unset=True,
-                        exclude_none=True,
-                        exclude={"target", "source"},
-                    )
-                )
-
-            attrs["u_of_edge"] = str(model.source)
-            attrs["v_of_edge"] = str(model.target)
-            return attrs
-
+        triples = []
         for edge in edges:
             if hasattr(edge, "as_edge"):
                 # if the edge has an as_edge method we can use it to get the
@@ -70,26 +303,20 @@ class LineageGraph:
                 edge = edge.as_edge  # type: ignore
                 assert isinstance(edge, LineageNode), "Edge must be an instance of Edge"
 
-                self.graph.add_edge(**attrs_from_model(edge))  # type: ignore
-            elif isinstance(edge, BaseModel):
-                # if the edge is a BaseModel we might have extra attributes
-                # that we want to add to the graph
+            triples.append(_edge_from_model(edge))
 
-                self.graph.add_edge(**attrs_from_model(edge))
-            else:
-                # if the edge is not a BaseModel we just add it as is
-                self.graph.add_edge(str(edge.source), str(edge.target))
+        self.graph.add_edges_from(triples)
 
     def add_table_edges(self, table_edges: Set[TableLineage]):
         """Add edges representing table relationships to the graph.
 
-        This method takes a set of `SourceTable` objects, where each object
+        This method takes a set of `TableLineage` objects, where each object
         represents a relationship between a source table and a target table.
         It then adds these relationships as edges to the graph with the edge
         type set to "TABLE".
 
         Args:
-            table_edges (Set[SourceTable]): A set of `SourceTable` objects
+            table_edges (Set[TableLineage]): A set of `TableLineage` objects
                 representing the edges to be added to the graph. Each edge
                 contains a source table and a target table.
 
@@ -110,6 +337,39 @@ class LineageGraph:
         """
         self.add_edges(list(column_edges))
 
+    def _format_edge(self, u: str, v: str, d: Mapping[str, Any]) -> str:
+        """Format an edge in the format "source_node --> target_node [attribute: value, ...]".
+
+        Args:
+            u (str): The source node of the edge.
+            v (str): The target node of the edge.
+            d (Mapping[str, Any]): The data of the edge, only the attributes in
+                `_attrs` are included.
+
+        Returns:
+            str: The formatted edge. If no attributes are present the edge is
+                formatted as "source_node --> target_node".
+
+        """
+        _types = [f"{attr}: {value}" for attr in self._attrs if (value := d.get(attr))]
+
+        if _types:
+            return f"{u} --> {v} [{', '.join(_types)}]"
+        return f"{u} --> {v}"
+
+    def _iter_pretty_lines(self) -> Iterator[str]:
+        """Yield a human-readable line for each of the graph's edges.
+
+        Yields:
+            str: The edge formatted by `_format_edge`.
+
+        """
+        format_edge = self._format_edge
+
+        for u, neighbours in self.graph.succ.items():
+            for v, d in neighbours.items():
+                yield format_edge(u, v, d)
+
     def pretty_string(self) -> str:
         """Generate a human-readable string representation of the graph's edges.
 
@@ -124,26 +384,29 @@ class LineageGraph:
                  "source_node --> target_node".
 
         """
-        _str = []
-
-        for u, v, d in self.graph.edges(data=True):
+        return "\n".join(self._iter_pretty_lines())
 
-            types_string = ""
-            _types = []
-            for attr in self._attrs:
-                if d.get(attr):
-                    _types.append(f"{attr}: {d[attr]}")
+    def pretty_print(self, file: Optional[TextIO] = None):
+        """Print the graph in a human-readable format.
 
-            if _types:
-                types_string = f" [{', '.join(_types)}]"
+        The edges are written one line at a time rather than building the whole
+        string first.
 
-            _str.append(f"{u} --> {v}{types_string}")
+        Args:
+            file (TextIO, optional): The stream to write to. Defaults to None, which
+                writes to `sys.stdout`.
 
-        return "\n".join(_str)
+        """
+        write = (file or sys.stdout).write
+        empty = True
+        for line in self._iter_pretty_lines():
+            write(line)
+            write("\n")
+            empty = False
 
-    def pretty_print(self):
-        """Print the graph in a human-readable format."""
-        print(self.pretty_string())
+        if empty:
+            # match print("") for a graph without edges
+            write("\n")
 
     def print_neighbourhood(self, paths: List[List[LineageNode]]):
         """Print the neighborhood of nodes for each path in the provided list of paths.
@@ -173,9 +436,49 @@ class LineageGraph:
                 objects representing parsed SQL expressions.
 
         """
+        # insert every expression's edges in one batch
+        edges: List[NodeType] = []
         for expression in parsed_expressions:
-            self.add_edges(list(expression.tables))
-            self.add_edges(list(expression.columns))
+            edges.extend(expression.tables)
+            edges.extend(expression.columns)
+
+        self.add_edges(edges)
+
+    def save(self, path: Union[str, Path]):
+        """Save the graph to disk so it can be reused without parsing the SQL again.
+
+        Args:
+            path (Union[str, Path]): The file to write the graph to.
+
+        """
+        with Path(path).open("wb") as dst:
+            pickle.dump(self.graph, dst, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LineageGraph":
+        """Load a graph previously written by `save`.
+
+        The file is unpickled, so only load files from a trusted source.
+
+        Args:
+            path (Union[str, Path]): The file to read the graph from.
+
+        Returns:
+            LineageGraph: The loaded lineage graph.
+
+        """
+        with Path(path).open("rb") as src:
+            graph = pickle.load(src)
+
+        if not isinstance(graph, nx.DiGraph):
+            raise TypeError(f"{path} does not contain a lineage graph.")
+
+        lineage_graph = cls()
+        lineage_graph.graph = (
+            graph if isinstance(graph, _LineageDiGraph) else _LineageDiGraph(graph)
+        )
+
+        return lineage_graph
 
     def is_root_node(
         self, node: str, node_type: Literal["COLUMN", "TABLE"] = "COLUMN"
@@ -193,9 +496,16 @@ class LineageGraph:
             bool: True if the node is a root node of the specified type, False otherwise.
 
         """
+        if node not in self._graph:
+            raise NetworkXError(f"The node {node} is not in the digraph.")
+
+        typed_nodes = self._get_typed_nodes()
+        if typed_nodes is not None:
+            return node not in typed_nodes[0].get(node_type, ())
+
         return all(
-            self.graph.edges[u, node].get("node_type") != node_type
-            for u in self.graph.predecessors(node)
+            data.get("node_type") != node_type
+            for data in self._graph.pred[node].values()
         )
 
     def is_leaf_node(
@@ -215,9 +525,16 @@ class LineageGraph:
             bool: True if the node is a leaf node of the specified type, False otherwise.
 
         """
+        if node not in self._graph:
+            raise NetworkXError(f"The node {node} is not in the digraph.")
+
+        typed_nodes = self._get_typed_nodes()
+        if typed_nodes is not None:
+            return node not in typed_nodes[1].get(node_type, ())
+
         return all(
-            self.graph.edges[node, u].get("node_type") != node_type
-            for u in self.graph.successors(node)
+            data.get("node_type") != node_type
+            for data in self._graph.succ[node].values()
         )
 
     def get_node_lineage(
@@ -244,26 +561,40 @@ class LineageGraph:
             of dictionaries representing the steps in the lineage.
 
         """
+        if node not in self.graph:
+            raise NetworkXError(f"The node {node} is not in the graph.")
+
+        key = ("lineage", node, node_type, max_steps)
+        cached = self._get_cached_paths(key)
+        if cached is not None:
+            return cached
+
         chains = []
-        ancestors = nx.ancestors(self.graph, node)
-        # Step 1: Identify root nodes (true sources)
-        root_nodes = [node for node in ancestors if self.is_root_node(node, node_type)]
+        seen: Set[Tuple[str, ...]] = set()
 
-        for source in root_nodes:
-            for path in nx.all_simple_paths(self.graph, source, node):
+        # walk the graph backwards from the node, a path is complete each time
+        # a root node (true source) is reached
+        for reverse_path, reverse_edges in self._iter_simple_paths(
+            node, self.graph.pred, self.is_root_node, node_type
+        ):
+            path = reverse_path[::-1]
+            edges = reverse_edges[::-1]
 
-                # manipulate the paths to get the correct number of steps
-                if max_steps:
-                    srt = list(reversed(path))
-                    sliced = srt[: max_steps + 1]
-                    path = list(reversed(sliced))
+            # keep the last steps of the path, those closest to the node
+            if max_steps:
+                path = path[-(max_steps + 1) :]
+                edges = edges[-max_steps:]
 
-                step_info = self._extract_path_steps(path, max_steps)
-                if step_info not in chains:
-                    # Avoid duplicates
-                    chains.append(step_info)
+            path_key = tuple(path)
+            if path_key in seen:
+                # Avoid duplicates
+                continue
+            seen.add(path_key)
 
-        return chains
+            chains.append(self._extract_path_steps(path, edges))
+
+        self._cache_paths(key, chains)
+        return _copy_chains(chains)
 
     def get_node_descendants(
         self,
@@ -289,20 +620,37 @@ class LineageGraph:
             representing a path from the `source_node` to a root node of the specified type.
 
         """
-        descendents = nx.descendants(self.graph, node)
+        if node not in self.graph:
+            raise NetworkXError(f"The node {node} is not in the graph.")
+
+        key = ("descendants", node, node_type, max_steps)
+        cached = self._get_cached_paths(key)
+        if cached is not None:
+            return cached
 
-        root_nodes = [
-            node for node in descendents if self.is_leaf_node(node, node_type)
-        ]
         chains = []
-        for source in root_nodes:
-            for path in nx.all_simple_paths(self.graph, node, source):
-                step_info = self._extract_path_steps(path, max_steps)
-                if step_info not in chains:
-                    # Avoid duplicates
-                    chains.append(step_info)
+        seen: Set[Tuple[str, ...]] = set()
 
-        return chains
+        # walk the graph forwards from the node, a path is complete each time
+        # a leaf node is reached
+        for path, edges in self._iter_simple_paths(
+            node, self.graph.succ, self.is_leaf_node, node_type
+        ):
+            # only the first steps of the path are extracted
+            if max_steps:
+                path = path[: max_steps + 1]
+                edges = edges[:max_steps]
+
+            path_key = tuple(path)
+            if path_key in seen:
+                # Avoid duplicates
+                continue
+            seen.add(path_key)
+
+            chains.append(self._extract_path_steps(path, edges))
+
+        self._cache_paths(key, chains)
+        return _copy_chains(chains)
 
     def get_node_neighbours(
         self,
@@ -352,15 +700,59 @@ class LineageGraph:
 
         return chains
 
+    def _iter_simple_paths(
+        self,
+        node: str,
+        adjacency: Mapping[str, Mapping[str, Any]],
+        is_end: Callable[[str, Literal["COLUMN", "TABLE"]], bool],
+        node_type: Literal["COLUMN", "TABLE"],
+    ) -> Iterator[Tuple[List[str], List[Mapping[str, Any]]]]:
+        """Yield every simple path from a node that finishes on an end node.
+
+        The graph is walked depth first from `node` using `adjacency`, which is
+        either `self.graph.succ` (downstream) or `self.graph.pred` (upstream). End
+        nodes are identified as they are visited, so only one traversal is needed.
+        The data of each edge walked is collected alongside the nodes so it does not
+        have to be looked up again.
+
+        Args:
+            node (str): The node to start walking from.
+            adjacency (Mapping[str, Mapping[str, Any]]): The adjacency to follow.
+            is_end (Callable[[str, Literal["COLUMN", "TABLE"]], bool]): Returns True
+                if a node completes a path, e.g. `is_root_node` or `is_leaf_node`.
+            node_type (Literal["COLUMN", "TABLE"]): The type of node passed to `is_end`.
+
+        Yields:
+            Tuple[List[str], List[Mapping[str, Any]]]: The nodes of each path and the
+                data of the edges between them, in the order they were visited.
+
+        """
+        stack: List[Tuple[str, List[str], List[Mapping[str, Any]]]] = [
+            (node, [node], [])
+        ]
+        while stack:
+            current, path, edges = stack.pop()
+            for neighbour, data in adjacency[current].items():
+                if neighbour in path:
+                    # avoid cycles
+                    continue
+
+                next_path = path + [neighbour]
+                next_edges = edges + [data]
+                stack.append((neighbour, next_path, next_edges))
+
+                if is_end(neighbour, node_type):
+                    yield next_path, next_edges
+
     def _extract_path_steps(
-        self, path: list, max_steps: Optional[int] = None
+        self, path: List[str], edges: List[Mapping[str, Any]]
     ) -> List[LineageNode]:
         """Extract detailed information about each step in a given path within the graph.
 
         Args:
-            path (list): A list of nodes representing a path in the graph.
-            max_steps (int, optional): The maximum number of steps to extract from the path.
-                Defaults to None.
+            path (List[str]): A list of nodes representing a path in the graph.
+            edges (List[Mapping[str, Any]]): The data of the edge between each pair
+                of consecutive nodes in `path`.
 
         Returns:
             list: A list of dictionaries, where each dictionary contains information
@@ -368,20 +760,17 @@ class LineageGraph:
                   associated with the edge connecting them.
 
         """
-        step_info = []
-        for i in range(min(max_steps or len(path), len(path) - 1)):
-            u, v = path[i], path[i + 1]
-            edge = self.graph.get_edge_data(u, v)
+        attrs = self._attrs
 
+        step_info = []
+        for u, v, edge in zip(path, path[1:], edges):
             lineage_result = {
                 "source": u,
                 "target": v,
+                **{attr: edge[attr] for attr in attrs if edge.get(attr)},
             }
 
-            for attr in self._attrs:
-                if edge.get(attr):
-                    lineage_result[attr] = edge[attr]
-
-            step_info.append(LineageNode.model_validate(lineage_result))
+            # the edge data was validated when it was added to the graph
+            step_info.append(LineageNode.model_construct(**lineage_result))
 
         return step_info
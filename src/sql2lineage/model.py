@@ -2,20 +2,42 @@
 
 # pylint: disable=no-member
 
-import re
-from typing import Dict, Optional, Set, Tuple, TypeAlias
+import sys
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeAlias,
+)
 
 from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
     PrivateAttr,
-    computed_field,
+    TypeAdapter,
+    field_serializer,
     model_serializer,
 )
+from pydantic.json_schema import SkipJsonSchema
 from sqlglot import Expression
 from sqlglot.dialects.dialect import DialectType
-from sqlglot.expressions import Alias, Column, From, Star, Struct
+from sqlglot.expressions import (
+    DDL,
+    Alias,
+    Column,
+    DerivedTable,
+    From,
+    PivotAlias,
+    Query,
+    Star,
+    Struct,
+)
 
 from sql2lineage.types.model import (
     STRUCT_COLUMN_TYPES,
@@ -24,7 +46,6 @@ from sql2lineage.types.model import (
     DataTable,
     Schema,
     SchemaColumn,
-    SchemaTable,
     TableLineage,
 )
 from sql2lineage.utils import SimpleTupleStore
@@ -33,6 +54,17 @@ SourceColumn: TypeAlias = DataColumn
 TargetColumn: TypeAlias = DataColumn
 ColumnAction: TypeAlias = str
 
+COPY: ColumnAction = "COPY"
+"""The column is copied from its source unchanged."""
+TRANSFORM: ColumnAction = "TRANSFORM"
+"""The column is derived from an expression over its source."""
+SourceColumnKey: TypeAlias = Tuple[
+    Optional[str], str, Tuple[str, ...], Optional[DataTable]
+]
+SourceLookups: TypeAlias = Tuple[
+    Dict[str, DataTable], Dict[str, Set[str]], Dict[SourceColumnKey, DataColumn]
+]
+
 
 class DummyParent:
     """Dummy parent class for expressions without a parent."""
@@ -47,6 +79,10 @@ class DummyParent:
 
 DUMMY_PARENT = DummyParent()
 
+# serialise whole lists of lineage in one call rather than one model at a time
+_COLUMNS_ADAPTER = TypeAdapter(List[ColumnLineage])
+_TABLES_ADAPTER = TypeAdapter(List[TableLineage])
+
 
 class ParsedExpression(BaseModel):
     """Parsed expression information."""
@@ -84,7 +120,12 @@ class ParsedExpression(BaseModel):
     )
 
     def __hash__(self):
-        return hash((self.target, tuple(self.columns), tuple(self.tables)))
+        # the columns and tables grow while the expression is parsed, so the
+        # expression is hashed and compared by identity
+        return id(self)
+
+    def __eq__(self, other: object) -> bool:
+        return self is other
 
     @property
     def expression_str(self) -> str:
@@ -111,57 +152,97 @@ class ParsedExpression(BaseModel):
                   dictionary representations of the subqueries.
 
         """
+        result = self._serialise_fields()
+
+        # nested subqueries are serialised with an explicit stack rather than
+        # recursion, so deeply nested queries cannot exhaust the call stack
+        stack = [(result["subqueries"], self.subqueries)]
+        while stack:
+            parent, subqueries = stack.pop()
+            for key, subquery in subqueries.items():
+                parent[key] = data = subquery._serialise_fields()
+                stack.append((data["subqueries"], subquery.subqueries))
+
+        return result
+
+    def _serialise_fields(self) -> Dict[str, Any]:
+        """Serialize this expression without its subqueries."""
         return {
             "target": self.target.model_dump(),
-            "columns": [col.model_dump() for col in self.columns],
-            "tables": [src.model_dump() for src in self.tables],
-            "subqueries": {
-                key: value.serialise_to_dict() for key, value in self.subqueries.items()
-            },
+            "columns": _COLUMNS_ADAPTER.dump_python(list(self.columns)),
+            "tables": _TABLES_ADAPTER.dump_python(list(self.tables)),
+            "subqueries": {},
             "expression": self.expression_str,
         }
 
+    def _source_lookups(self) -> SourceLookups:
+        """Index the source tables by alias and the subquery columns by subquery.
+
+        Where several source tables share an alias the first one found is kept. The
+        last lookup is an empty memo of the source columns already resolved.
+        """
+        aliases: Dict[str, DataTable] = {}
+        for tbl in self.tables:
+            if tbl.alias:
+                aliases.setdefault(tbl.alias, tbl.source)
+
+        subquery_columns = {
+            name: {col.target.name for col in subquery.columns}
+            for name, subquery in self.subqueries.items()
+        }
+        return aliases, subquery_columns, {}
+
     def _get_source_column(
         self,
         column: Column,
         source_table: Optional[DataTable],
         table_store: SimpleTupleStore[str, DataTable],
+        lookups: Optional[SourceLookups] = None,
     ) -> DataColumn:
+        # the sqlglot accessors rebuild their values from the node args on
+        # every access, so read each of them once
+        table = column.table
+        name = column.name
+
+        aliases, subquery_columns, resolved = lookups or self._source_lookups()
+
+        # the same column is often referenced several times in one select
+        part_names = tuple(part.name for part in column.parts)
+        key = (table, name, part_names, source_table)
+        if (source := resolved.get(key)) is not None:
+            return source
+
         _source_column = None
         _source_table = source_table
-        if column.table:
-            for tbl in self.tables:
-                if column.table == tbl.alias:
-                    _source_column = column.name
-                    _source_table = tbl.source
-                    break
-
-            # check subqueries
-            if _source_column is None:
-                subquery = self.subqueries.get(column.table)
-                if subquery:
-                    # does the column exist in the subquery?
-                    for col in subquery.columns:
-                        if col.target.name == column.name:
-                            _source_column = col.target.name
-                            _source_table = subquery.target
-                            break
-
-        elif column.parts and source_table:
-            joined_parts = ".".join([identifier.name for identifier in column.parts])
-            _source_column = joined_parts.replace(source_table.name, "").strip(".")
-        elif column.parts:
-            _source_column = column.parts[-1].name
-            _table = ".".join([identifier.name for identifier in column.parts[:-1]])
-            _source_table = table_store.get(_table)
+        if table:
+            if table in aliases:
+                _source_column = name
+                _source_table = aliases[table]
+
+            # check subqueries, does the column exist in the subquery?
+            elif name in subquery_columns.get(table, ()):
+                _source_column = name
+                _source_table = self.subqueries[table].target
+
+        # an unqualified column belongs to the source table, the table is only
+        # looked up from the column parts when there is no source table
+        elif part_names and not source_table:
+            _source_column = part_names[-1]
+            _source_table = table_store.get(".".join(part_names[:-1]))
 
         if _source_column is None:
             # if we still don't have a source column, use the column name
-            _source_column = column.name
+            _source_column = name
 
         if _source_table and self._schema:
             self._schema.add_table_column(_source_table.name, _source_column)
-        return DataColumn(name=_source_column or "", table=_source_table)
+        # the names come from the parsed expression and the tables are already
+        # validated models, so validation is skipped on this hot path. The same
+        # source columns are referenced many times so their names are interned
+        resolved[key] = source = DataColumn.model_construct(
+            name=sys.intern(_source_column or ""), table=_source_table
+        )
+        return source
 
     def _process_struct_override(
         self,
@@ -184,14 +265,14 @@ class ParsedExpression(BaseModel):
         fields = column.fields or []
         to_add = []
         for field in fields:
-            source_column = DataColumn(
+            source_column = DataColumn.model_construct(
                 name=f"{column.name}.{field.name}",
                 table=source_table,
             )
-            target_column = DataColumn(
+            target_column = DataColumn.model_construct(
                 name=f"{target_column_name or column.name}.{field.name}", table=target
             )
-            to_add.append((source_column, target_column, "COPY"))
+            to_add.append((source_column, target_column, COPY))
 
         self._add_columns(*to_add)
 
@@ -202,40 +283,37 @@ class ParsedExpression(BaseModel):
         target: DataTable,
         table_store: SimpleTupleStore[str, DataTable],
         alias: Optional[str] = None,
+        lookups: Optional[SourceLookups] = None,
     ):
 
-        # handle struct columns - burst them out
-        if alias is None:
-            alias = expression.alias
-        else:
-            alias = f"{alias}.{expression.alias}"
-
-        schema_column = SchemaColumn(name=alias, type="STRUCT", fields=[])
-
-        for expr in expression.this.expressions:
-
-            # check if the column is a struct
-            if isinstance(expr, Struct):
-                self._process_struct(
-                    expr,
-                    source,
-                    target,
-                    table_store,
-                    alias=alias,
-                )
+        # handle struct columns - burst them out. Nested structs are queued
+        # rather than recursed into, the loop picks up the appended entries so
+        # they are handled in the order they are found
+        pending: List[Tuple[Expression, Optional[str]]] = [(expression, alias)]
+        for struct, parent_alias in pending:
+            if parent_alias is None:
+                struct_alias = struct.alias
             else:
+                struct_alias = f"{parent_alias}.{struct.alias}"
 
-                expr_name = expr.alias_or_name or expr.name
-                if not isinstance(expr, Column):
-                    expr = expr.expression
+            fields: List[SchemaColumn] = []
+            for expr in struct.this.expressions:
+                if isinstance(expr, Struct):
+                    pending.append((expr, struct_alias))
+                    continue
 
-                source_column = self._get_source_column(expr, source, table_store)
-                target_column = DataColumn(name=f"{alias}.{expr_name}", table=target)
+                expr_name = expr.alias_or_name or expr.name
+                # a named struct field, the source is the expression it names
+                column = expr if isinstance(expr, Column) else expr.expression
 
-                if schema_column.fields is None:
-                    schema_column.fields = []
+                source_column = self._get_source_column(
+                    column, source, table_store, lookups
+                )
+                target_column = DataColumn.model_construct(
+                    name=f"{struct_alias}.{expr_name}", table=target
+                )
 
-                schema_column.fields.append(
+                fields.append(
                     SchemaColumn(
                         name=expr_name,
                         type="SIMPLE",
@@ -243,30 +321,35 @@ class ParsedExpression(BaseModel):
                     )
                 )
 
-                self.columns.add(
-                    ColumnLineage(
-                        target=target_column,
-                        source=source_column,
-                        action="COPY",
-                    )
+                self._add_column_lineage(source_column, target_column, COPY)
+
+            if self._schema:
+                if target.name not in self._schema:
+                    self._schema.add(target.name)
+                self._schema.add_table_column(
+                    target.name,
+                    SchemaColumn(name=struct_alias, type="STRUCT", fields=fields),
                 )
-        if self._schema:
-            if target.name not in self._schema:
-                self._schema.add(target.name)
-            self._schema.add_table_column(target.name, schema_column)
+
+    def _add_column_lineage(
+        self, source: SourceColumn, target: TargetColumn, action: ColumnAction
+    ):
+        """Add a column lineage, duplicates are dropped by the `columns` set."""
+        # the fields were validated when the columns were created
+        self.columns.add(
+            ColumnLineage.model_construct(
+                target=target,
+                source=source,
+                action=action,
+            )
+        )
 
     def _add_columns(
         self,
         *columns: Tuple[SourceColumn, TargetColumn, ColumnAction],
     ):
         for source, target, action in columns:
-            self.columns.add(
-                ColumnLineage(
-                    target=target,
-                    source=source,
-                    action=action,
-                )
-            )
+            self._add_column_lineage(source, target, action)
 
             if self._schema:
                 if target.table is None:
@@ -317,10 +400,14 @@ class ParsedExpression(BaseModel):
             None
 
         """  # noqa: D212
-        if not hasattr(expression, "selects"):
+        # the expression types that have a list of selected columns, a Table also
+        # has `selects` but it is always empty
+        if not isinstance(expression, (Query, DerivedTable, DDL)):
             return
 
-        for select in expression.selects:  # type: ignore
+        lookups = self._source_lookups()
+
+        for select in expression.selects:
 
             if isinstance(select.this, Struct):
                 # handle struct columns - burst them out
@@ -329,150 +416,180 @@ class ParsedExpression(BaseModel):
                     source,
                     target,
                     table_store,
+                    lookups=lookups,
                 )
+                continue
 
-            elif isinstance(select, Column):
+            handler = self._select_handlers.get(type(select))
+            if handler is not None:
+                handler(self, select, source, target, table_store, lookups)
 
-                source_column = self._get_source_column(select, source, table_store)
+    def _update_from_column(
+        self,
+        select: Column,
+        source: DataTable,
+        target: DataTable,
+        table_store: SimpleTupleStore[str, DataTable],
+        lookups: SourceLookups,
+    ):
+        source_column = self._get_source_column(select, source, table_store, lookups)
 
-                # check if the column is in the struct override
-                if self._check_struct(source_column):
-                    self._process_struct_override(source_column, target)
-                else:
-                    target_column = DataColumn(name=select.alias_or_name, table=target)
-                    self._add_columns(
-                        (source_column, target_column, "COPY"),
-                    )
+        # check if the column is in the struct override
+        if self._check_struct(source_column):
+            self._process_struct_override(source_column, target)
+        else:
+            target_column = DataColumn.model_construct(
+                name=select.alias_or_name, table=target
+            )
+            self._add_columns(
+                (source_column, target_column, COPY),
+            )
 
-            # find column aliases - transformations
-            elif isinstance(select, Alias):
-                if isinstance(select.this, Column):
-                    # alias is a column
-                    source_column = self._get_source_column(
-                        select.this, source, table_store
-                    )
+    def _update_from_alias(
+        self,
+        select: Alias,
+        source: DataTable,
+        target: DataTable,
+        table_store: SimpleTupleStore[str, DataTable],
+        lookups: SourceLookups,
+    ):
+        # find column aliases - transformations
+        if isinstance(select.this, Column):
+            # alias is a column
+            source_column = self._get_source_column(
+                select.this, source, table_store, lookups
+            )
 
-                    # check if the column is in the struct override
-                    if self._check_struct(source_column):
-                        self._process_struct_override(source_column, target)
-                    else:
-                        target_column = DataColumn(
-                            name=select.alias_or_name, table=target
-                        )
+            # check if the column is in the struct override
+            if self._check_struct(source_column):
+                self._process_struct_override(source_column, target)
+            else:
+                target_column = DataColumn.model_construct(
+                    name=select.alias_or_name, table=target
+                )
 
-                        self.columns.add(
-                            ColumnLineage(
-                                target=target_column,
-                                source=source_column,
-                                action="COPY",
-                            )
-                        )
+                self._add_column_lineage(source_column, target_column, COPY)
 
+        else:
+            # the alias wraps an expression rather than a bare column, so
+            # every column it references is transformed
+            alias_name = select.alias_or_name
+            for column in select.find_all(Column):
+                source_column = self._get_source_column(
+                    column, source, table_store, lookups
+                )
+
+                if self._check_struct(source_column):
+                    self._process_struct_override(source_column, target, alias_name)
                 else:
+                    target_column = DataColumn.model_construct(
+                        name=alias_name, table=target
+                    )
 
-                    for column in select.find_all(Column):
-                        source_column = self._get_source_column(
-                            column, source, table_store
-                        )
+                    self._add_column_lineage(source_column, target_column, TRANSFORM)
 
-                        if self._check_struct(source_column):
-                            self._process_struct_override(
-                                source_column, target, select.alias_or_name
-                            )
-                        else:
-
-                            pattern = re.compile(
-                                f"(?: as) {column.alias_or_name}", re.IGNORECASE
-                            )
-                            sql = pattern.sub("", select.sql())
-                            action = "TRANSFORM" if sql != column.sql() else "COPY"
-
-                            target_column = DataColumn(
-                                name=select.alias_or_name, table=target
-                            )
-
-                            self.columns.add(
-                                ColumnLineage(
-                                    target=target_column,
-                                    source=source_column,
-                                    action=action,
-                                )
-                            )
-
-            # elif expression.find(Star):
-            elif isinstance(select, Star):
-
-                select_from = (
-                    select.find(From)
-                    or (select.parent or DUMMY_PARENT).find(From)
-                    or (select.parent_select or DUMMY_PARENT).find(From)
-                )
-                if select_from:
-                    # if the star is used in a FROM clause, we need to find the source table
-                    source_table = table_store.get(select_from.alias_or_name)
+    def _update_from_star(
+        self,
+        select: Star,
+        source: DataTable,  # pylint: disable=unused-argument
+        target: DataTable,
+        table_store: SimpleTupleStore[str, DataTable],
+        lookups: SourceLookups,  # pylint: disable=unused-argument
+    ):
+        select_from = (
+            select.find(From)
+            or (select.parent or DUMMY_PARENT).find(From)
+            or (select.parent_select or DUMMY_PARENT).find(From)
+        )
+        if select_from:
+            # if the star is used in a FROM clause, we need to find the source table
+            source_table = table_store.get(select_from.alias_or_name)
+
+            # we need to find all columns in the source table
+            self._get_star_columns(target, source_table)
 
-                    # we need to find all columns in the source table
-                    self._get_star_columns(target, source_table)
+        else:
+            raise ValueError(
+                f"Unable to identify From clause for Star(*): {self.expression}."
+            )
 
-                else:
-                    raise ValueError(
-                        f"Unable to identify From clause for Star(*): {self.expression}."
-                    )
+    _select_handlers: ClassVar[Dict[type, Callable[..., None]]] = {
+        Column: _update_from_column,
+        Alias: _update_from_alias,
+        PivotAlias: _update_from_alias,
+        Star: _update_from_star,
+    }
+    """Handlers for each type of select, keyed on the exact type of the select."""
 
     def _get_star_columns(
         self,
         target: DataTable,
         source_table: DataTable | None = None,
+        columns_by_table: Optional[Dict[str, List[ColumnLineage]]] = None,
     ):
         if source_table is None:
             return
 
+        if columns_by_table is None:
+            # index a snapshot of the columns by their target table, columns are
+            # added as we go and the index is shared with any recursive calls
+            columns_by_table = {}
+            for column in self.columns:
+                if column.target.table:
+                    columns_by_table.setdefault(column.target.table.name, []).append(
+                        column
+                    )
+
         # check the expression for CTE columns
-        for column in list(self.columns):
-            if column.target.table and column.target.table.name == source_table.name:
-                if column.target.name == "*":
-                    self._get_star_columns(target, column.source.table)
-                else:
-                    target_column = DataColumn(name=column.target.name, table=target)
+        for column in columns_by_table.get(source_table.name, ()):
+            if column.target.name == "*":
+                self._get_star_columns(target, column.source.table, columns_by_table)
+            else:
+                target_column = DataColumn.model_construct(
+                    name=column.target.name, table=target
+                )
 
-                    self._add_columns(
-                        (
-                            column.target,
-                            target_column,
-                            "COPY",
-                        )
+                self._add_columns(
+                    (
+                        column.target,
+                        target_column,
+                        COPY,
                     )
+                )
 
         # check the schema for columns from other tables
-        if self._schema:
-            for column in self._schema.get(
-                source_table.name, SchemaTable(name="default", type="NONE")
-            ).columns:
+        schema_table = self._schema.get(source_table.name) if self._schema else None
+        if schema_table:
+            for column in schema_table.columns:
 
                 if column.type in STRUCT_COLUMN_TYPES:
                     # if the column is a struct, we need to burst it out
                     fields = column.fields or []
                     to_add = []
                     for field in fields:
-                        source_column = DataColumn(
+                        source_column = DataColumn.model_construct(
                             name=f"{column.name}.{field.name}",
                             table=source_table,
                         )
-                        target_column = DataColumn(
+                        target_column = DataColumn.model_construct(
                             name=f"{column.name}.{field.name}", table=target
                         )
-                        to_add.append((source_column, target_column, "COPY"))
+                        to_add.append((source_column, target_column, COPY))
 
                     self._add_columns(*to_add)
 
                 else:
-                    target_column = DataColumn(name=column.name, table=target)
+                    target_column = DataColumn.model_construct(
+                        name=column.name, table=target
+                    )
 
                     self._add_columns(
                         (
-                            DataColumn(name=column.name, table=source_table),
+                            DataColumn.model_construct(
+                                name=column.name, table=source_table
+                            ),
                             target_column,
-                            "COPY",
+                            COPY,
                         )
                     )
 
@@ -480,57 +597,46 @@ class ParsedExpression(BaseModel):
 class ParsedResult(BaseModel):
     """Parsed result of the SQL expression."""
 
-    _expressions: list[ParsedExpression] = PrivateAttr(
-        default_factory=list,
+    # ParsedExpression holds sqlglot expressions which have no JSON schema
+    expressions: SkipJsonSchema[List[ParsedExpression]] = Field(
+        default_factory=list, description="List of parsed expressions."
     )
-    _columns: Set[ColumnLineage] = PrivateAttr(
-        default_factory=set,
+    columns: Set[ColumnLineage] = Field(
+        default_factory=set, description="List of column lineage information."
     )
-    _tables: Set[TableLineage] = PrivateAttr(
-        default_factory=set,
+    tables: Set[TableLineage] = Field(
+        default_factory=set, description="List of source tables."
     )
 
     _schema: Optional[Schema] = PrivateAttr(
         default=None,
     )
 
-    @computed_field
-    @property
-    def expressions(self) -> list[ParsedExpression]:
-        """List of parsed expressions."""
-        return self._expressions
-
-    @computed_field
-    @property
-    def columns(self) -> Set[ColumnLineage]:
-        """List of column lineage information."""
-        return self._columns
-
-    @computed_field
-    @property
-    def tables(self) -> Set[TableLineage]:
-        """List of source tables."""
-        return self._tables
-
     def add(self, expression: ParsedExpression) -> None:
         """Add a parsed expression to the result."""
-        self._expressions.append(expression)
+        self.expressions.append(expression)
 
-        for column in list(expression.columns or []):
-            self._columns.add(column)
+        self.columns.update(expression.columns)
+        self.tables.update(expression.tables)
 
-        for table in list(expression.tables or []):
-            self._tables.add(table)
+    # a set of the serialised dicts cannot be built, so the lineage is dumped as
+    # a list and each model is serialised natively by pydantic
+    @field_serializer("columns")
+    def _serialise_columns(self, columns: Set[ColumnLineage]) -> List[ColumnLineage]:
+        return list(columns)
 
-    @model_serializer
-    def serialise_to_dict(self):
+    @field_serializer("tables")
+    def _serialise_tables(self, tables: Set[TableLineage]) -> List[TableLineage]:
+        return list(tables)
+
+    def serialise_to_dict(self) -> Dict[str, Any]:
         """Serialize the current object into a dictionary representation.
 
         Returns:
             dict: A dictionary containing the serialized data with the following keys:
                 - "expressions": A list of serialized expressions, where each expression
                   is represented as a dictionary obtained by calling `serialise_to_dict`
-                  on each expression in `self._expressions`.
+                  on each expression in `self.expressions`.
                 - "columns": A sorted list of dictionaries representing columns, where
                   each dictionary contains:
                     - "target": The target of the column.
@@ -546,10 +652,4 @@ class ParsedResult(BaseModel):
                   The list is sorted by the tuple (target, source, alias).
 
         """
-        return {
-            "expressions": [
-                expression.serialise_to_dict() for expression in self._expressions
-            ],
-            "columns": [col.model_dump() for col in self._columns],
-            "tables": [src.model_dump() for src in self._tables],
-        }
+        return self.model_dump()
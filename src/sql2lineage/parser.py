@@ -6,6 +6,7 @@ This module provides a class to parse SQL queries and extract lineage informatio
 # pylint: disable=no-member
 import asyncio
 import logging
+import sys
 from os import PathLike
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Sequence, Set, TypeAlias
@@ -30,6 +31,7 @@ from sqlglot.expressions import (
 )
 
 from sql2lineage.model import (
+    COPY,
     ColumnLineage,
     DataColumn,
     DataTable,
@@ -136,6 +138,9 @@ class SQLLineageParser:  # noqa: D101 # pylint: disable=missing-class-docstring
             str: The joined string representation of the expressions.
 
         """
+        if len(parts) == 1:
+            # an unqualified table name needs no join
+            return parts[0].name
         return ".".join([identifier.name for identifier in parts])
 
     def _get_or_create_source_table(
@@ -190,7 +195,7 @@ class SQLLineageParser:  # noqa: D101 # pylint: disable=missing-class-docstring
             parsed_expression.columns.add(column)
 
         parsed_expression.tables.add(
-            TableLineage(
+            TableLineage.model_construct(
                 target=parsed_expression.target,
                 source=source_table,
                 alias=subquery.alias_or_name,
@@ -347,7 +352,9 @@ class SQLLineageParser:  # noqa: D101 # pylint: disable=missing-class-docstring
         type: Optional[TableType] = None,  # pylint: disable=redefined-builtin
     ) -> ParsedExpression:
 
-        target = target or self._extract_target(expression, index)
+        # the target name is shared by every table and column lineage of the
+        # expression
+        target = sys.intern(target or self._extract_target(expression, index))
 
         if type is None and isinstance(expression, Select):
             type = "QUERY"
@@ -510,17 +517,20 @@ class SQLLineageParser:  # noqa: D101 # pylint: disable=missing-class-docstring
     ):
         st = self._join_parts(parts)
 
-        source_table = DataTable(
-            name=st,
-            type=self._table_store.get(
-                st, DataTable(name="", type=type) if type else DATATABLE_DEFAULT
-            ).type,
-        )
+        stored_table = self._table_store.get(st)
+        if stored_table is not None:
+            table_type = stored_table.type
+        else:
+            table_type = type or DATATABLE_DEFAULT.type
+
+        # the name and type come from the parsed expression and the table store,
+        # so the models are built without validation
+        source_table = DataTable.model_construct(name=st, type=table_type)
 
-        if st not in self._table_store:
+        if stored_table is None:
             self._table_store[st] = source_table
         parsed_expression.tables.add(
-            TableLineage(
+            TableLineage.model_construct(
                 target=target,
                 source=source_table,
                 alias=alias,
@@ -536,10 +546,10 @@ class SQLLineageParser:  # noqa: D101 # pylint: disable=missing-class-docstring
         target: DataColumn,
     ):
         parsed_expression.columns.add(
-            ColumnLineage(
+            ColumnLineage.model_construct(
                 target=target,
                 source=source,
-                action="COPY",
+                action=COPY,
             )
         )
 
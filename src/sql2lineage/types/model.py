@@ -2,7 +2,8 @@
 
 # pylint: disable=no-member
 
-from typing import Optional, TypeVar, overload
+from abc import abstractmethod
+from typing import Any, Optional, TypeVar, overload
 
 from pydantic import (
     BaseModel,
@@ -39,7 +40,32 @@ class LineageNode(BaseModel):
         return f"{self.source} -> {self.target}"
 
 
-class DataTable(BaseModel):
+class _FrozenModel(BaseModel):
+    """Base for immutable models which are hashed into sets.
+
+    Subclasses implement `_hash_key`, the hash is computed from it once and cached.
+    It is held in a slot rather than a private attribute so it is not part of the
+    equality check.
+    """
+
+    __slots__ = ("_cached_hash",)
+
+    model_config = ConfigDict(frozen=True)
+
+    @abstractmethod
+    def _hash_key(self) -> tuple:
+        """Get the values the model is hashed on."""
+
+    def __hash__(self):
+        try:
+            return self._cached_hash
+        except AttributeError:
+            cached_hash = hash(self._hash_key())
+            object.__setattr__(self, "_cached_hash", cached_hash)
+            return cached_hash
+
+
+class DataTable(_FrozenModel):
     """Table information."""
 
     name: str = Field(..., description="The name of the table.")
@@ -48,8 +74,8 @@ class DataTable(BaseModel):
         description="The type of the table (e.g., 'TABLE', 'SUBQUERY', 'CTE').",
     )
 
-    def __hash__(self):
-        return hash((self.name, self.type))
+    def _hash_key(self) -> tuple:
+        return (self.name, self.type)
 
     def __str__(self) -> str:
         """Get the string representation of the table."""
@@ -61,7 +87,7 @@ class DataTable(BaseModel):
         return str(self)
 
 
-class TableLineage(BaseModel):
+class TableLineage(_FrozenModel):
     """Source table information."""
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -70,8 +96,8 @@ class TableLineage(BaseModel):
     source: DataTable = Field(..., description="The source table of the expression.")
     alias: Optional[str] = Field(None, description="The alias of the source table.")
 
-    def __hash__(self):
-        return hash((self.target, self.source, self.alias))
+    def _hash_key(self) -> tuple:
+        return (self.target, self.source, self.alias)
 
     @computed_field
     @property
@@ -93,16 +119,22 @@ class TableLineage(BaseModel):
 
     @property
     def as_edge(self):
-        """Get the column lineage as an edge."""
-        attrs = self.model_dump(
-            exclude_unset=True, exclude_none=True, exclude={"target", "source"}
-        )
-        attrs["source"] = self.source.to_str
-        attrs["target"] = self.target.to_str
-        return LineageNode.model_validate(attrs)
-
-
-class DataColumn(BaseModel):
+        """Get the table lineage as an edge."""
+        attrs: dict[str, Any] = {
+            "source": self.source.to_str,
+            "target": self.target.to_str,
+            "node_type": self.node_type,
+            "source_type": self.source_type,
+            "target_type": self.target_type,
+        }
+        if self.alias is not None:
+            attrs["alias"] = self.alias
+
+        # the fields were validated when the lineage was created
+        return LineageNode.model_construct(**attrs)
+
+
+class DataColumn(_FrozenModel):
     """Column information."""
 
     table: Optional[DataTable] = Field(
@@ -110,8 +142,8 @@ class DataColumn(BaseModel):
     )
     name: str = Field(..., description="The name of the column.")
 
-    def __hash__(self):
-        return hash((self.table, self.name))
+    def _hash_key(self) -> tuple:
+        return (self.table, self.name)
 
     def __str__(self) -> str:
         """Get the string representation of the column."""
@@ -127,7 +159,7 @@ class DataColumn(BaseModel):
         return str(self)
 
 
-class ColumnLineage(BaseModel):
+class ColumnLineage(_FrozenModel):
     """Column lineage information."""
 
     target: DataColumn = Field(..., description="The ouput column name.")
@@ -136,8 +168,8 @@ class ColumnLineage(BaseModel):
         None, description="The action performed on the column."
     )
 
-    def __hash__(self):
-        return hash((self.target, self.source, self.action))
+    def _hash_key(self) -> tuple:
+        return (self.target, self.source, self.action)
 
     @computed_field
     @property
@@ -164,12 +196,18 @@ class ColumnLineage(BaseModel):
     @property
     def as_edge(self):
         """Get the column lineage as an edge."""
-        attrs = self.model_dump(
-            exclude_unset=True, exclude_none=True, exclude={"target", "source"}
-        )
-        attrs["source"] = self.source.to_str
-        attrs["target"] = self.target.to_str
-        return LineageNode.model_validate(attrs)
+        attrs: dict[str, Any] = {
+            "source": self.source.to_str,
+            "target": self.target.to_str,
+            "node_type": self.node_type,
+            "source_type": self.source_type,
+            "target_type": self.target_type,
+        }
+        if self.action is not None:
+            attrs["action"] = self.action
+
+        # the fields were validated when the lineage was created
+        return LineageNode.model_construct(**attrs)
 
 
 # region schema
@@ -190,10 +228,16 @@ class SchemaColumn(BaseModel):
 class SchemaTable(DataTable):
     """Schema table information."""
 
+    model_config = ConfigDict(frozen=False)
+
     columns: list[SchemaColumn] = Field(
         description="The columns of the table.", default_factory=list
     )
 
+    def __hash__(self):
+        # the table is mutable so the hash cannot be cached
+        return hash(self._hash_key())
+
     def __contains__(self, item: str | SchemaColumn) -> bool:
         """Check if the table contains a column with the given name."""
         if isinstance(item, str):
@@ -162,6 +162,15 @@ class SimpleTupleStore(Generic[T, V]):
         return default
 
 
+def _is_node(item: object) -> bool:
+    """Check if an item conforms to `NodeType`.
+
+    `LineageNode` is checked first, the nominal check is far cheaper than the
+    runtime protocol check and graph lineage is always made of `LineageNode`.
+    """
+    return isinstance(item, LineageNode) or isinstance(item, NodeType)
+
+
 def validate_chains(
     chains: Union[Sequence[Sequence[NodeType]], Sequence[NodeType], NodeType],
 ) -> List[List[NodeType]]:
@@ -188,8 +197,8 @@ def validate_chains(
 
     """
     # Case 1: chains is a single NodeType instance.
-    if isinstance(chains, NodeType):
-        return [[chains]]
+    if _is_node(chains):
+        return [[chains]]  # type: ignore
 
     # At this point we expect chains to be a sequence.
     if not isinstance(chains, Sequence):
@@ -201,10 +210,10 @@ def validate_chains(
 
     # Case 2: chains is a sequence of NodeType instances.
     # Check the first element.
-    if isinstance(chains[0], NodeType):
+    if _is_node(chains[0]):
         # Further verify each element in the sequence.
         for item in chains:
-            if not isinstance(item, NodeType):
+            if not _is_node(item):
                 raise ValueError("All items in the sequence must conform to NodeType.")
         # Wrap in a list since the outer structure should be a list of lists.
         return [list(chains)]  # type: ignore
@@ -217,7 +226,7 @@ def validate_chains(
         # Allow empty chains, or verify that all elements in the chain are NodeType.
         chain_list = list(chain)
         for node in chain_list:
-            if not isinstance(node, NodeType):
+            if not _is_node(node):
                 raise ValueError(
                     f"An item in chain {idx} does not conform to NodeType."
                 )
@@ -1,14 +1,17 @@
 """Test the graph module."""
 
+import io
 from pathlib import Path
 from typing import Generator
 
+import networkx as nx
 import pytest
+from networkx.exception import NetworkXError
 
 from sql2lineage.graph import LineageGraph
 from sql2lineage.model import ParsedResult
 from sql2lineage.parser import SQLLineageParser
-from sql2lineage.types.model import LineageNode
+from sql2lineage.types.model import DataTable, LineageNode, TableLineage
 
 
 class TestGraph:
@@ -73,6 +76,202 @@ class TestGraph:
             in captured.out
         )
 
+    def test_pretty_print_to_file(self, expression: ParsedResult):
+        """Test that pretty_print writes to the given stream."""
+
+        graph = LineageGraph()
+        graph.from_parsed(expression.expressions)
+
+        stream = io.StringIO()
+        graph.pretty_print(file=stream)
+
+        assert stream.getvalue() == graph.pretty_string() + "\n"
+
+    def test_pretty_print_empty_graph(self):
+        """Test that pretty_print writes a single newline for an empty graph."""
+
+        stream = io.StringIO()
+        LineageGraph().pretty_print(file=stream)
+
+        assert stream.getvalue() == "\n"
+
+    def test_root_and_leaf_updated_on_add(self, expression: ParsedResult):
+        """Test that root/leaf classifications are refreshed when edges are added."""
+
+        graph = LineageGraph()
+        graph.from_parsed(expression.expressions)
+
+        assert graph.is_root_node("raw.orders", node_type="TABLE")
+        assert graph.is_leaf_node("big_orders", node_type="TABLE")
+
+        graph.add_table_edges(
+            {
+                TableLineage(
+                    target=DataTable(name="raw.orders", type="TABLE"),
+                    source=DataTable(name="upstream", type="TABLE"),
+                ),
+                TableLineage(
+                    target=DataTable(name="downstream", type="TABLE"),
+                    source=DataTable(name="big_orders", type="TABLE"),
+                ),
+            }
+        )
+
+        assert not graph.is_root_node("raw.orders", node_type="TABLE")
+        assert not graph.is_leaf_node("big_orders", node_type="TABLE")
+
+    def test_root_and_leaf_follow_direct_graph_changes(
+        self, expression: ParsedResult
+    ):
+        """Test that root/leaf checks see edges added to `graph.graph` directly."""
+
+        graph = LineageGraph()
+        graph.from_parsed(expression.expressions)
+
+        graph.graph.add_edge(
+            "upstream",
+            "raw.orders",
+            node_type="TABLE",
+            source_type="TABLE",
+            target_type="TABLE",
+        )
+
+        assert graph.is_root_node("upstream", node_type="TABLE")
+        assert not graph.is_root_node("raw.orders", node_type="TABLE")
+        assert graph.is_root_node("raw.orders", node_type="COLUMN")
+
+        # adding the same pair through add_edges must not fail
+        graph.add_table_edges(
+            {
+                TableLineage(
+                    target=DataTable(name="raw.orders", type="TABLE"),
+                    source=DataTable(name="upstream", type="TABLE"),
+                ),
+            }
+        )
+        assert not graph.is_root_node("raw.orders", node_type="TABLE")
+
+    def test_root_and_leaf_on_plain_digraph(self):
+        """Test root/leaf checks on a plain DiGraph assigned to `graph.graph`."""
+
+        graph = LineageGraph()
+        graph.graph = nx.DiGraph()
+        graph.graph.add_edge("a", "b", node_type="TABLE")
+
+        assert graph.is_root_node("a", node_type="TABLE")
+        assert not graph.is_root_node("b", node_type="TABLE")
+        assert graph.is_leaf_node("b", node_type="TABLE")
+        assert graph.is_root_node("b", node_type="COLUMN")
+
+        with pytest.raises(NetworkXError):
+            graph.is_root_node("missing", node_type="TABLE")
+
+    def test_lineage_cache_invalidated(self, expression: ParsedResult):
+        """Test that cached lineage is refreshed when edges are added."""
+
+        graph = LineageGraph()
+        graph.from_parsed(expression.expressions)
+
+        lineage = graph.get_node_lineage("big_orders", node_type="TABLE")
+        assert graph.get_node_lineage("big_orders", node_type="TABLE") == lineage
+
+        graph.add_table_edges(
+            {
+                TableLineage(
+                    target=DataTable(name="raw.orders", type="TABLE"),
+                    source=DataTable(name="upstream", type="TABLE"),
+                ),
+            }
+        )
+
+        updated = graph.get_node_lineage("big_orders", node_type="TABLE")
+        assert updated != lineage
+        assert all(chain[0].source == "upstream" for chain in updated)
+
+    def test_lineage_cache_follows_direct_graph_changes(
+        self, expression: ParsedResult
+    ):
+        """Test that cached lineage is refreshed when `graph.graph` is changed."""
+
+        graph = LineageGraph()
+        graph.from_parsed(expression.expressions)
+
+        lineage = graph.get_node_lineage("big_orders", node_type="TABLE")
+
+        graph.graph.add_edge(
+            "upstream",
+            "raw.orders",
+            node_type="TABLE",
+            source_type="TABLE",
+            target_type="TABLE",
+        )
+
+        updated = graph.get_node_lineage("big_orders", node_type="TABLE")
+        assert updated != lineage
+        assert all(chain[0].source == "upstream" for chain in updated)
+
+        graph.graph.remove_edge("upstream", "raw.orders")
+        assert graph.get_node_lineage("big_orders", node_type="TABLE") == lineage
+
+    def test_lineage_cache_unchanged_by_mutated_result(
+        self, expression: ParsedResult
+    ):
+        """Test that changing a returned node does not change cached lineage."""
+
+        graph = LineageGraph()
+        graph.from_parsed(expression.expressions)
+
+        lineage = graph.get_node_lineage("big_orders", node_type="TABLE")
+        lineage[0][0].action = "CHANGED"
+        lineage[0].clear()
+
+        cached = graph.get_node_lineage("big_orders", node_type="TABLE")
+        assert cached[0]
+        assert all(
+            getattr(node, "action", None) != "CHANGED"
+            for chain in cached
+            for node in chain
+        )
+
+        descendants = graph.get_node_descendants("orders_with_tax", node_type="TABLE")
+        descendants[0][0].target = "changed"
+
+        cached = graph.get_node_descendants("orders_with_tax", node_type="TABLE")
+        assert cached[0][0].target == "filtered_orders"
+
+    def test_lineage_cache_is_bounded(
+        self, expression: ParsedResult, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that the least recently used lineage is dropped from a full cache."""
+
+        monkeypatch.setattr("sql2lineage.graph._PATH_CACHE_SIZE", 2)
+
+        graph = LineageGraph()
+        graph.from_parsed(expression.expressions)
+
+        for node in ("orders_with_tax", "filtered_orders", "big_orders"):
+            graph.get_node_lineage(node, node_type="TABLE")
+
+        assert list(graph._path_cache) == [
+            ("lineage", "filtered_orders", "TABLE", None),
+            ("lineage", "big_orders", "TABLE", None),
+        ]
+
+    def test_save_and_load(self, expression: ParsedResult, tmp_path: Path):
+        """Test that a saved graph can be loaded and queried."""
+
+        graph = LineageGraph()
+        graph.from_parsed(expression.expressions)
+        graph.save(tmp_path / "lineage.pkl")
+
+        loaded = LineageGraph.load(tmp_path / "lineage.pkl")
+
+        assert loaded.pretty_string() == graph.pretty_string()
+        assert loaded.is_root_node("raw.orders", node_type="TABLE")
+        assert loaded.get_node_lineage(
+            "big_orders", node_type="TABLE"
+        ) == graph.get_node_lineage("big_orders", node_type="TABLE")
+
     def test_get_node_lineage(self, expression: ParsedResult):
         """Test the get_node_lineage method."""
 
@@ -1,6 +1,8 @@
 """Test model."""
 
 # pylint: disable=no-member
+import sys
+
 import pytest
 import sqlglot
 from sqlglot import Expression
@@ -223,6 +225,35 @@ class TestSerialisation:
         """Test serialisation."""
         assert obj.model_dump() == expected
 
+    def test_serialisation_deeply_nested_subqueries(self):
+        """Test serialisation of subqueries nested beyond the recursion limit."""
+
+        depth = sys.getrecursionlimit() + 100
+        expression = ParsedExpression(
+            target=DataTable(name="q0", type="SUBQUERY"), expression=EXPRESSION
+        )
+        root = expression
+        for i in range(1, depth):
+            subquery = ParsedExpression(
+                target=DataTable(name=f"q{i}", type="SUBQUERY"), expression=EXPRESSION
+            )
+            expression.subqueries[f"q{i}"] = subquery
+            expression = subquery
+
+        result = root.model_dump()
+        for i in range(1, depth):
+            result = result["subqueries"][f"q{i}"]
+            assert result["target"] == {"name": f"q{i}", "type": "SUBQUERY"}
+        assert result["subqueries"] == {}
+
+    def test_parsed_result_json_schema(self):
+        """Test a JSON schema can be generated for ParsedResult."""
+
+        schema = ParsedResult.model_json_schema()
+
+        assert "expressions" not in schema["properties"]
+        assert set(schema["properties"]) == {"columns", "tables"}
+
 
 # classes to represent Column from sqlglot
 
@@ -337,6 +368,16 @@ class TestParsedExpression:
                 None,
                 id="From parts with source table",
             ),
+            pytest.param(
+                Column(
+                    name="orders_id",
+                    parts=[Part(name="orders_id")],
+                ),
+                "orders.orders_id",
+                DataTable(name="orders", type="TABLE"),
+                None,
+                id="Column name containing the source table name",
+            ),
             pytest.param(
                 Column(
                     name="target_column",
@@ -368,3 +409,41 @@ class TestParsedExpression:
         assert (
             f"{actual.table.name}.{actual.name}" == expected
         ), f"Expected {expected}, got {actual}"
+
+    def test__get_source_column_memoised(self, parsed_expression):
+        """Test _get_source_column reuses columns resolved with the same lookups."""
+
+        lookups = parsed_expression._source_lookups()
+        source_table = DataTable(name="source.table", type="TABLE")
+        first = parsed_expression._get_source_column(
+            Column(name="target_column", table="alias"), source_table, None, lookups
+        )
+        second = parsed_expression._get_source_column(
+            Column(name="target_column", table="alias"), source_table, None, lookups
+        )
+        other = parsed_expression._get_source_column(
+            Column(name="other_column", table="alias"), source_table, None, lookups
+        )
+
+        assert first is second
+        assert other.name == "other_column"
+
+    def test_update_column_lineage_after_columns_reset(self):
+        """Test rows are added again after `columns` is replaced directly."""
+
+        expression = sqlglot.parse_one("select a, b as c from src", read="bigquery")
+        source = DataTable(name="src", type="TABLE")
+        target = DataTable(name="tgt", type="TABLE")
+        parsed_expression = ParsedExpression(target=target, expression=expression)
+
+        parsed_expression.update_column_lineage(
+            expression, source, target, SimpleTupleStore()
+        )
+        columns = set(parsed_expression.columns)
+        assert len(columns) == 2
+
+        parsed_expression.columns = set()
+        parsed_expression.update_column_lineage(
+            expression, source, target, SimpleTupleStore()
+        )
+        assert parsed_expression.columns == columns